@@ -1,10 +1,15 @@
-import uuid
+import itertools
 import logging
-import json
+import orjson
 
 # No direct client import needed here if make_request is passed
 # from client import make_request 
 
+logger = logging.getLogger(__name__)
+
+# Unique suffixes for hit_invalid_path without a uuid4/os.urandom call per request
+_invalid_path_ids = itertools.count(1)
+
 # --- Action Functions ---
 # Each function now accepts the make_request function as its first argument
 
@@ -15,7 +20,7 @@ def get_all_products(make_request):
     response = make_request("products")
     if response is not None:
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Check if the top-level structure contains a 'data' key
             if isinstance(data, dict) and 'data' in data:
                 products_list = data['data']
@@ -23,28 +28,31 @@ def get_all_products(make_request):
                  # Handle cases where the API might return just the list directly
                  products_list = data
             else:
-                logging.error(f"Expected a dict with 'data' key or a list from GET /products, got {type(data)}.")
+                logger.error("Expected a dict with 'data' key or a list from GET /products, got %s.", type(data))
                 return None
 
             if not isinstance(products_list, list):
-                logging.error(f"Expected 'data' field to be a list or direct list response from GET /products, got {type(products_list)}.")
+                logger.error("Expected 'data' field to be a list or direct list response from GET /products, got %s.", type(products_list))
                 return None # Indicate error/invalid structure
 
-            # Filter for valid product dictionaries (basic check)
-            valid_products = [item for item in products_list if isinstance(item, dict) and 'productID' in item and 'name' in item]
-            logging.info(f"GET_ALL found {len(valid_products)} valid products.")
+            # The product service always returns a list of product objects, so the list is trusted
+            # as-is; the per-item check only runs when debug logging is enabled.
+            valid_products = products_list
+            if logger.isEnabledFor(logging.DEBUG):
+                valid_products = [item for item in products_list if isinstance(item, dict) and 'productID' in item and 'name' in item]
+            logger.info("GET_ALL found %d valid products.", len(valid_products))
             return valid_products # Return the list of valid product dicts
 
-        except json.JSONDecodeError:
-            logging.error("Failed to decode JSON response from GET /products during simulation.")
+        except orjson.JSONDecodeError:
+            logger.error("Failed to decode JSON response from GET /products during simulation.")
         # Keep KeyError for potential issues within items if needed, though checked above
         except KeyError as e:
-             logging.error(f"Response items from GET /products during simulation might be missing keys: {e}")
+             logger.error("Response items from GET /products during simulation might be missing keys: %s", e)
              # Depending on strictness, might return partial list or None
              # Let's return None for now if basic structure fails
              return None
         except Exception as e:
-            logging.error(f"An unexpected error occurred processing GET /products response during simulation: {e}", exc_info=True)
+            logger.error("An unexpected error occurred processing GET /products response during simulation: %s", e, exc_info=True)
     return None # Return None if request failed or processing errored
 
 def update_product_stock(make_request, product_name, new_stock):
@@ -56,7 +64,7 @@ def update_product_stock(make_request, product_name, new_stock):
 
 def hit_invalid_path(make_request):
     """Hits a deliberately non-existent path."""
-    make_request(f"some/invalid/path/{uuid.uuid4()}")
+    make_request(f"some/invalid/path/{next(_invalid_path_ids)}")
 
 def hit_status_endpoint(make_request):
     """Hits the /health health check endpoint (previously was /status)."""
@@ -73,25 +81,27 @@ def get_products_by_category(make_request, category):
     response = make_request(f"products/category?category={category}")
     if response is not None:
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Check for the 'data' wrapper
             if isinstance(data, dict) and 'data' in data and isinstance(data['data'], list):
                  products_list = data['data']
             elif isinstance(data, list): # Fallback for direct list
                  products_list = data
             else:
-                logging.error(f"Expected a dict with 'data' key or a list from GET /products/category, got {type(data)}.")
+                logger.error("Expected a dict with 'data' key or a list from GET /products/category, got %s.", type(data))
                 return None
 
-            # Extract product dictionaries containing 'name'
-            category_products = [item for item in products_list if isinstance(item, dict) and 'name' in item]
-            logging.info(f"GET_CATEGORY '{category}' found {len(category_products)} products.")
+            # Trusted as-is like GET /products; validate items only when debug logging is enabled
+            category_products = products_list
+            if logger.isEnabledFor(logging.DEBUG):
+                category_products = [item for item in products_list if isinstance(item, dict) and 'name' in item]
+            logger.info("GET_CATEGORY '%s' found %d products.", category, len(category_products))
             return category_products # Return list of product dicts
-        except json.JSONDecodeError:
-            logging.error("Failed to decode JSON response from GET /products/category.")
+        except orjson.JSONDecodeError:
+            logger.error("Failed to decode JSON response from GET /products/category.")
         # Removed KeyError check for productID
         except Exception as e:
-            logging.error(f"An unexpected error occurred processing GET /products/category response: {e}", exc_info=True)
+            logger.error("An unexpected error occurred processing GET /products/category response: %s", e, exc_info=True)
     return None
 
 def get_product_by_name(make_request, name):
@@ -101,17 +111,17 @@ def get_product_by_name(make_request, name):
     if response is not None:
         try:
             # Assuming the response is the product details if successful
-            data = response.json()
+            data = orjson.loads(response.content)
             if isinstance(data, dict) and 'productID' in data:
-                 logging.info(f"GET_BY_NAME found product: {data.get('productID')}")
+                 logger.info("GET_BY_NAME found product: %s", data.get('productID'))
                  return data # Return the full product dict
             else:
-                logging.error(f"Unexpected response structure from POST /products/details: {data}")
+                logger.error("Unexpected response structure from POST /products/details: %s", data)
                 return None
-        except json.JSONDecodeError:
-            logging.error("Failed to decode JSON response from POST /products/details.")
+        except orjson.JSONDecodeError:
+            logger.error("Failed to decode JSON response from POST /products/details.")
         except Exception as e:
-            logging.error(f"An unexpected error occurred processing POST /products/details response: {e}", exc_info=True)
+            logger.error("An unexpected error occurred processing POST /products/details response: %s", e, exc_info=True)
     return None
 
 def buy_product(make_request, product_name, quantity):
@@ -121,9 +131,9 @@ def buy_product(make_request, product_name, quantity):
     response = make_request("products/buy", method="POST", json_payload=payload)
     # Check for success based on status code (assuming 2xx is success)
     if response is not None and 200 <= response.status_code < 300:
-        logging.info(f"BUY_PRODUCT successful for NAME {product_name}, quantity {quantity}.")
+        logger.info("BUY_PRODUCT successful for NAME %s, quantity %s.", product_name, quantity)
         return True
     else:
         status = response.status_code if response is not None else 'No Response'
-        logging.warning(f"BUY_PRODUCT failed for NAME {product_name}, quantity {quantity}. Status: {status}")
+        logger.warning("BUY_PRODUCT failed for NAME %s, quantity %s. Status: %s", product_name, quantity, status)
         return False 
\ No newline at end of file
@@ -38,18 +38,20 @@ var predefinedBusinessErrors = []simulatedErrorBlueprint{
 func Simulate(ctx context.Context) *apierrors.AppError {
 	cfg := globals.Cfg() // Assuming Cfg() returns a struct that will have the new fields
 
-	// It's good practice to seed the random number generator only once if possible,
-	// but for a debug utility called potentially spread out, per-call seeding is acceptable.
-	// Using a single rng instance per call, seeded once.
-	source := rand.NewSource(time.Now().UnixNano())
-	rng := rand.New(source)
+	// Both simulations are off by default; skip the random draws entirely in that case
+	if !cfg.SimulateDelayEnabled && !cfg.SimulateRandomErrorEnabled {
+		return nil
+	}
+
+	// The top-level math/rand functions are seeded automatically and safe for concurrent use,
+	// so no per-call source (and its seeding and allocation) is needed on the request path.
 
 	// Existing Delay Simulation Logic
 	if cfg.SimulateDelayEnabled {
 		// Check for valid delay configuration
 		if !(cfg.SimulateDelayMinMs < 0 || cfg.SimulateDelayMaxMs <= 0 || cfg.SimulateDelayMinMs >= cfg.SimulateDelayMaxMs) {
 			delayRange := cfg.SimulateDelayMaxMs - cfg.SimulateDelayMinMs
-			randomDelayMs := rng.Intn(delayRange+1) + cfg.SimulateDelayMinMs
+			randomDelayMs := rand.Intn(delayRange+1) + cfg.SimulateDelayMinMs
 			delayDuration := time.Duration(randomDelayMs) * time.Millisecond
 			time.Sleep(delayDuration)
 		}
@@ -68,7 +70,7 @@ func Simulate(ctx context.Context) *apierrors.AppError {
 	}
 
 	// Decide if *any* error should be thrown based on the overall chance
-	if rng.Float64() < overallErrorChance {
+	if rand.Float64() < overallErrorChance {
 		appWeight := cfg.SimulateApplicationErrorWeight
 		bizWeight := cfg.SimulateBusinessErrorWeight
 
@@ -86,24 +88,24 @@ func Simulate(ctx context.Context) *apierrors.AppError {
 		var chosenBlueprint *simulatedErrorBlueprint
 
 		if canSimulateApp && !canSimulateBiz { // Only application errors are possible
-			selectedIndex := rng.Intn(len(predefinedApplicationErrors))
+			selectedIndex := rand.Intn(len(predefinedApplicationErrors))
 			blblueprint := predefinedApplicationErrors[selectedIndex] // Corrected variable name
 			chosenBlueprint = &blblueprint
 		} else if !canSimulateApp && canSimulateBiz { // Only business errors are possible
-			selectedIndex := rng.Intn(len(predefinedBusinessErrors))
+			selectedIndex := rand.Intn(len(predefinedBusinessErrors))
 			blblueprint := predefinedBusinessErrors[selectedIndex] // Corrected variable name
 			chosenBlueprint = &blblueprint
 		} else if canSimulateApp && canSimulateBiz { // Both categories are possible, use weights
 			totalWeight := appWeight + bizWeight
 			// totalWeight should be > 0 here because canSimulateApp and canSimulateBiz are true
-			decisionRoll := rng.Intn(totalWeight)
+			decisionRoll := rand.Intn(totalWeight)
 
 			if decisionRoll < appWeight {
-				selectedIndex := rng.Intn(len(predefinedApplicationErrors))
+				selectedIndex := rand.Intn(len(predefinedApplicationErrors))
 				blblueprint := predefinedApplicationErrors[selectedIndex] // Corrected variable name
 				chosenBlueprint = &blblueprint
 			} else {
-				selectedIndex := rng.Intn(len(predefinedBusinessErrors))
+				selectedIndex := rand.Intn(len(predefinedBusinessErrors))
 				blblueprint := predefinedBusinessErrors[selectedIndex] // Corrected variable name
 				chosenBlueprint = &blblueprint
 			}
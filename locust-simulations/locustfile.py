@@ -1,31 +1,110 @@
 import os
 import logging
-import time
-from typing import Dict, Any, Optional
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
-from locust import HttpUser, task, between, tag, events
-from locust.clients import ResponseContextManager
-import random
-import time
-from typing import List
+import gevent
+from gevent.event import Event
+from gevent.lock import Semaphore
+from locust import task, between, tag, events
 
 # Assuming these are still relevant and in the correct path after consolidation
 from src.utils.shared_data import SharedData
-from src.utils.http_validation import validate_response, check_status_code, check_content_type, check_products_list_schema
+from src.utils.http_validation import check_status_code, check_content_type, check_products_list_schema
 from src.base_user import BaseAPIUser
+from src.utils.json_codec import dumps
+
+# Locust configures logging itself (--loglevel/--logfile) after this file is imported, replacing
+# the root handlers, so the extra locust.log output is attached from the init event instead.
+# Records are queued and written out by a listener thread so tasks never wait on log I/O
+_log_listener = None
+
+@events.init.add_listener
+def _setup_log_file(environment, **kwargs):
+    global _log_listener
+    log_level = os.environ.get("LOCUST_LOG_LEVEL")
+    if not log_level or _log_listener is not None:
+        return
+    level = logging.getLevelName(log_level.upper())
+    if not isinstance(level, int):
+        logging.getLogger("locustfile").warning("Invalid LOCUST_LOG_LEVEL '%s', locust.log disabled", log_level)
+        return
+    
+    file_handler = logging.FileHandler("locust.log")
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    
+    root = logging.getLogger()
+    if level < root.getEffectiveLevel():
+        # Let the lower level reach locust.log without changing what Locust's handlers print
+        for handler in root.handlers:
+            if handler.level < root.level:
+                handler.setLevel(root.level)
+        root.setLevel(level)
+    root.addHandler(queue_handler)
+    
+    _log_listener = QueueListener(log_queue, file_handler)
+    _log_listener.start()
+
+@events.quit.add_listener
+def _stop_log_file(**kwargs):
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler("locust.log"), logging.StreamHandler()]
-)
 logger = logging.getLogger("locustfile")
 shared_data = SharedData()
 
+# Only one user per worker fetches the initial products; the rest wait for it to finish
+_bootstrap_lock = Semaphore()
+_bootstrap_event = Event()
+
+
+@lru_cache(maxsize=1)
+def _compute_categories(products_version: int) -> Tuple[str, ...]:
+    # Keyed on the SharedData version so every user spawned against the same product
+    # snapshot reuses one result instead of rescanning the product list
+    products = shared_data.get_products()
+    return tuple({category for product in products if (category := product.get("category"))})
+
+
+@lru_cache(maxsize=None)
+def _expand_task_weights(task_weights: Tuple[Tuple[Any, int], ...]) -> Tuple[Any, ...]:
+    # Locust picks tasks with random.choice, so each task appears as often as its weight. Users with
+    # the same weights share one expanded tuple instead of each building its own list
+    return tuple(task_func for task_func, weight in task_weights for _ in range(weight))
+
 
 class SimulationUser(BaseAPIUser):
     
+    # Bodies are pre-encoded (orjson when available) and sent as data=, so the JSON headers are set explicitly
+    JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+    
+    # Validator chains are built once and shared by every request of the matching task
+    VALIDATE_STATUS = (check_status_code(200),)
+    VALIDATE_JSON = VALIDATE_STATUS + (check_content_type(),)
+    VALIDATE_PRODUCTS = VALIDATE_JSON + (check_products_list_schema,)
+    VALIDATE_BUY = (check_status_code((200, 409)), check_content_type())  # 409 = out of stock
+    # Every Nth category listing also gets the product schema check (including the first)
+    SCHEMA_SAMPLE_INTERVAL = 100
+    
+    # Upper bounds (seconds) of the full-jitter delay before each retry of the initial product
+    # load; other users wait on it. Jitter keeps the bootstrap users of several workers apart
+    INITIAL_LOAD_BACKOFF = (0.1, 0.2)
+    
+    # Buy quantities and stock levels are drawn RANDOM_BATCH_SIZE at a time and handed out one per task
+    BUY_QUANTITIES = range(1, 6)
+    STOCK_LEVELS = range(0, 501)
+    RANDOM_BATCH_SIZE = 512
+    
+    # Used by get_products_by_category until products (and their categories) have been loaded
+    FALLBACK_CATEGORIES = ("Electronics",)
+    
     DEFAULT_TASK_WEIGHTS = {
         "browse_all_products": 15,
         "get_products_by_category": 15,
@@ -39,23 +118,40 @@ class SimulationUser(BaseAPIUser):
     def configure_parser(parser):
         # Add arguments for task weights and max_executions
         for task_name, default_weight in SimulationUser.DEFAULT_TASK_WEIGHTS.items():
+            option_name = task_name.replace('_', '-')
             # Weight argument
             parser.add_argument(
-                f"--weight-{task_name.replace('_', '-')}",
+                f"--weight-{option_name}",
                 type=int,
                 env_var=f"LOCUST_WEIGHT_{task_name.upper()}",
-                default=None,  # Default to None to detect if user set it
+                default=default_weight,
                 help=f"Weight for {task_name} task (default: {default_weight})"
             )
             # Max execution argument
             parser.add_argument(
-                f"--max-{task_name.replace('_', '-')}",
+                f"--max-{option_name}",
                 type=int,
                 env_var=f"LOCUST_MAX_{task_name.upper()}",
                 default=-1,
                 help=f"Max executions for {task_name} task (-1=unlimited, 0=disabled)"
             )
 
+        # Retry settings used by BaseAPIUser._retry_request
+        parser.add_argument(
+            "--retry-attempts",
+            type=int,
+            env_var="LOCUST_RETRY_ATTEMPTS",
+            default=BaseAPIUser.RETRY_ATTEMPTS,
+            help=f"Attempts per request, including the first one (default: {BaseAPIUser.RETRY_ATTEMPTS})"
+        )
+        parser.add_argument(
+            "--retry-base-delay",
+            type=float,
+            env_var="LOCUST_RETRY_BASE_DELAY",
+            default=BaseAPIUser.RETRY_BASE_DELAY,
+            help=f"Base delay in seconds for the jittered retry backoff (default: {BaseAPIUser.RETRY_BASE_DELAY})"
+        )
+
         # Nginx proxy setting
         parser.add_argument(
             "--use-nginx-proxy", 
@@ -65,6 +161,35 @@ class SimulationUser(BaseAPIUser):
             help="Set to 'true' to route requests via Nginx proxy (e.g., /product-service/endpoint)"
         )
     
+    # Weight-expanded task table for the current run, built from the --weight-* options by the
+    # test_start listener and shared by every user
+    _TASKS: Optional[Tuple[Any, ...]] = None
+    
+    @classmethod
+    def resolve_task_weights(cls, environment) -> Dict[str, int]:
+        # argparse has already converted the options to int; only negative values need handling
+        parsed_options = getattr(environment, "parsed_options", None)
+        weights = {}
+        for task_name, default_weight in cls.DEFAULT_TASK_WEIGHTS.items():
+            weight = getattr(parsed_options, f"weight_{task_name}", default_weight)
+            if weight < 0:
+                logger.warning("User-defined weight '%s' for task '%s' is negative. Using default weight %s.", weight, task_name, default_weight)
+                weight = default_weight
+            weights[task_name] = weight
+        return weights
+    
+    @classmethod
+    def build_tasks(cls, weights: Dict[str, int]) -> Tuple[Any, ...]:
+        task_weights = {}
+        for task_name, weight in weights.items():
+            if weight > 0:
+                task_method = getattr(cls, task_name, None)
+                if task_method:
+                    task_weights[task_method] = weight
+                else:
+                    logger.warning("Task method %s not found in SimulationUser for dynamic weighting.", task_name)
+        return _expand_task_weights(tuple(task_weights.items()))
+    
     wait_time = between(1, 3)
     
     def __init__(self, *args, **kwargs):
@@ -72,243 +197,265 @@ class SimulationUser(BaseAPIUser):
         self.task_counts = {
             "health_check": 100 # Default, can be overridden by command line
         }
-        self.possible_categories = []
+        self.possible_categories = ()
+        self._snapshot_version = 0
+        # choice of the per-user generator, bound once for the task bodies
+        self._choice = self._rng.choice
+        self._quantity_buf = []
+        self._stock_buf = []
+        self._name_cache = {}
+        # Request bodies reused across tasks; they are filled in and encoded right away, and
+        # retries resend the encoded bytes
+        self._details_payload = {"name": None}
+        self._stock_payload = {"name": None, "stock": 0}
+        self._buy_payload = {"name": None, "quantity": 0}
+        self._category_params = {}  # Query params per category
 
-        # Dynamically build self.tasks
-        weighted_tasks_list = []
-        for task_name, default_weight in self.DEFAULT_TASK_WEIGHTS.items():
-            arg_name = f"weight_{task_name}" 
-            
-            user_weight_input_str = None # Stores the raw string from env/arg
-            if hasattr(self.environment, "parsed_options") and self.environment.parsed_options is not None:
-                # getattr might return '' if env var is set but empty, or None if not set
-                raw_user_weight = getattr(self.environment.parsed_options, arg_name, None)
-                if raw_user_weight is not None: # Ensure it's not None before checking if it's an empty string
-                    user_weight_input_str = str(raw_user_weight) # Ensure it's a string for consistent handling
-            
-            actual_weight = default_weight
-            if user_weight_input_str is not None: # Check if user provided any input
-                if user_weight_input_str == '': # Specifically handle empty string case
-                    logger.warning(f"User-defined weight for task '{task_name}' is an empty string. Using default weight {default_weight}.")
-                    # actual_weight remains default_weight
-                else:
-                    try:
-                        user_weight_int = int(user_weight_input_str)
-                        if user_weight_int >= 0: # Weights must be non-negative
-                            actual_weight = user_weight_int
-                        else:
-                            logger.warning(f"User-defined weight '{user_weight_input_str}' for task '{task_name}' is negative. Using default weight {default_weight}.")
-                            # actual_weight remains default_weight
-                    except ValueError:
-                        logger.warning(f"Could not convert user-defined weight '{user_weight_input_str}' for task '{task_name}' to int. Using default weight {default_weight}.")
-                        # actual_weight remains default_weight
-            
-            if actual_weight > 0:
-                task_method = getattr(type(self), task_name, None)
-                if task_method:
-                    for _ in range(actual_weight): # Append task_method actual_weight times
-                        weighted_tasks_list.append(task_method)
-                else:
-                    logger.warning(f"Task method {task_name} not found in SimulationUser for dynamic weighting.")
-        
-        self.tasks = weighted_tasks_list # Assign the constructed list to self.tasks
+        # Use the task table built once at test start; build it here only if test_start has not run
+        tasks = self._TASKS
+        if tasks is None:
+            tasks = self.build_tasks(self.resolve_task_weights(self.environment))
+        self.tasks = tasks
         
         if not self.tasks:
             logger.error("No tasks were assigned weights > 0 or no task methods found. SimulationUser will have no tasks to run!")
     
+    # Request names are "<base><label>"; labels (product/category names) are truncated for
+    # readability. Names carry no execution count, so Locust keeps one stats entry per endpoint
+    # and product/category however long the test runs
+    NAME_LABEL_MAX = 20
+    
+    def _req_name(self, base, label=""):
+        # The cache is keyed on the raw label, so a hit costs no slicing or concatenation
+        key = (base, label)
+        name = self._name_cache.get(key)
+        if name is None:
+            name = self._name_cache[key] = base + label[:self.NAME_LABEL_MAX]
+        return name
+    
     def on_start(self):
         super().on_start()
         self.shared_data = shared_data # Use the global instance
+        self._load_task_limits(self.DEFAULT_TASK_WEIGHTS)
+        # Endpoint paths only depend on the proxy settings, so resolve them once per user
+        self._path_products = self._get_path("/products")
+        self._path_category = self._get_path("/products/category")
+        self._path_details = self._get_path("/products/details")
+        self._path_stock = self._get_path("/products/stock")
+        self._path_buy = self._get_path("/products/buy")
+        self._path_health = self._get_path("/health")
         if not self.shared_data.get_products():
-            self._load_initial_products()
+            if _bootstrap_lock.acquire(blocking=False):
+                _bootstrap_event.clear()
+                try:
+                    self._load_initial_products()
+                finally:
+                    _bootstrap_event.set()
+                    _bootstrap_lock.release()
+            else:
+                _bootstrap_event.wait()
         self._initialize_test_data_params()
     
     def _initialize_test_data_params(self):
         # Extract categories from product data
-        products = self.shared_data.get_products()
-        if products:
-            # Extract unique categories from product data
-            self.possible_categories = list(set(product.get("category", "") for product in products if product.get("category")))
-            logger.info(f"Extracted categories from product data: {self.possible_categories}")
+        if self._sync_snapshot():
+            logger.info("Extracted categories from product data: %s", self.possible_categories)
+    
+    def _sync_snapshot(self):
+        # Returns the current products, refreshing this user's derived data (categories) only
+        # when SharedData has published a new version since the last call
+        version, products = self.shared_data.get_snapshot()
+        if version != self._snapshot_version:
+            self._snapshot_version = version
+            if products:
+                self.possible_categories = _compute_categories(version)
+        return products
+    
+    def _next_quantity(self):
+        buf = self._quantity_buf
+        if not buf:
+            buf = self._quantity_buf = self._rng.choices(self.BUY_QUANTITIES, k=self.RANDOM_BATCH_SIZE)
+        return buf.pop()
+    
+    def _next_stock(self):
+        buf = self._stock_buf
+        if not buf:
+            buf = self._stock_buf = self._rng.choices(self.STOCK_LEVELS, k=self.RANDOM_BATCH_SIZE)
+        return buf.pop()
+    
+    def _random_product(self):
+        products = self._sync_snapshot()
+        return self._choice(products) if products else None
     
     def _load_initial_products(self):
-        max_retries = 3
-        retry_delay = 2
+        max_retries = len(self.INITIAL_LOAD_BACKOFF) + 1
         
         for attempt in range(max_retries):
             try:
-                with self.client.get(self._get_path("/products"), name=f"Initial_Products_Load (Attempt {attempt+1})", catch_response=True) as response:
-                    logger.info(f"Initial product load response: {response.status_code}")
-                    logger.debug(f"Initial product load response text: {response.text}") # Use debug for potentially long text
+                with self._get(self._path_products, name=f"Initial_Products_Load (Attempt {attempt+1})", catch_response=True) as response:
+                    logger.info("Initial product load response: %s", response.status_code)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Initial product load body: %s", response.content[:512].decode("utf-8", "replace"))
                     if response.status_code == 200:
-                        products = self._extract_products(response)
+                        products = self._extract_products(response, self.SHARED_PRODUCT_FIELDS)
                         if products:
                             self.shared_data.update_products(products)
-                            logger.info(f"Loaded initial product data: {len(products)} products")
+                            logger.info("Loaded initial product data: %d products", len(products))
                             return True
                         else:
                             logger.warning("No products found in initial data load despite 200 OK")
                     else:
-                        logger.warning(f"Failed to load initial product data: {response.status_code} (Attempt {attempt+1}/{max_retries})")
-                
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5
+                        logger.warning("Failed to load initial product data: %s (Attempt %d/%d)", response.status_code, attempt + 1, max_retries)
             
             except Exception as e:
-                logger.error(f"Error during initial product load attempt {attempt+1}: {str(e)}")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 1.5
+                logger.error("Error during initial product load attempt %d: %s", attempt + 1, e)
+            
+            if attempt < max_retries - 1:
+                retry_delay = self._rng.uniform(0, self.INITIAL_LOAD_BACKOFF[attempt])
+                logger.info("Retrying in %.2f seconds...", retry_delay)
+                gevent.sleep(retry_delay)
         
-        logger.error(f"Failed to load initial product data after {max_retries} attempts")
+        logger.error("Failed to load initial product data after %d attempts", max_retries)
         return False
     
     @tag("browse")
     def browse_all_products(self):
-        task_name = "browse_all_products"
-        if not self._can_execute_task(task_name):
+        current_count = self._claim_task("browse_all_products")
+        if not current_count:
             return
         
-        current_count = self._increment_task_count(task_name)
-        request_name = f"Get_All_Products (#{current_count})"
-        
-        def request_func():
-            with self.client.get(self._get_path("/products"), name=request_name, catch_response=True) as response:
-                return response
+        request_name = self._req_name("Get_All_Products")
         
-        response = self._retry_request(
-            request_func, 
+        # Status and content type are checked up front; the product schema is checked while the
+        # products are extracted, so the body is parsed once
+        self._retry_request(
+            self._get,
+            self._path_products,
             request_name,
-            validators=[check_status_code(200), check_content_type(), check_products_list_schema]
+            validators=self.VALIDATE_JSON,
+            on_success=self.process_products_response
         )
-        self.process_products_response(response, update_shared_data=True)
     
     @tag("browse", "category")
     def get_products_by_category(self):
-        task_name = "get_products_by_category"
-        if not self._can_execute_task(task_name):
+        current_count = self._claim_task("get_products_by_category")
+        if not current_count:
             return
         
-        current_count = self._increment_task_count(task_name)
-        possible_categories = self.possible_categories if self.possible_categories else ["Electronics"]
-        category = random.choice(possible_categories)
-        request_name = f"Get_Products_By_Category_{category} (#{current_count})"
+        self._sync_snapshot()
+        category = self._choice(self.possible_categories or self.FALLBACK_CATEGORIES)
+        request_name = self._req_name("Get_Products_By_Category_", category)
         
-        def request_func():
-            with self.client.get(self._get_path("/products/category"), params={"category": category}, 
-                               name=request_name, catch_response=True) as response:
-                return response
+        # One params dict per category, kept unchanged so scheduled retries can reuse it
+        params = self._category_params.get(category)
+        if params is None:
+            params = self._category_params[category] = {"category": category}
         
-        response = self._retry_request(
-            request_func,
+        # The category listing is only validated, never stored; the full schema walk runs on a
+        # sample of the responses and the rest only get the status/content-type checks
+        validators = self.VALIDATE_PRODUCTS if current_count % self.SCHEMA_SAMPLE_INTERVAL == 1 else self.VALIDATE_JSON
+        self._retry_request(
+            self._get,
+            self._path_category,
             request_name,
-            validators=[check_status_code(200), check_content_type(), check_products_list_schema]
+            validators=validators,
+            params=params
         )
-        self.process_products_response(response, update_shared_data=False) # Don't necessarily update all products from category view
 
     @tag("shopping", "details")
     def get_product_by_name(self):
-        task_name = "get_product_by_name"
-        if not self._can_execute_task(task_name):
-            return
-            
-        product = self.shared_data.get_random_product()
+        product = self._random_product()
         if not product or not product.get("name"):
             # logger.debug("No product found or product has no name for get_product_by_name")
             return
         product_name = product.get("name")
-        current_count = self._increment_task_count(task_name)
-        request_name = f"Get_Product_By_Name_{product_name[:20]} (#{current_count})" # Truncate for readability
-        
-        def request_func():
-            with self.client.post(self._get_path("/products/details"), json={"name": product_name}, 
-                                name=request_name, catch_response=True) as response:
-                return response
+        current_count = self._claim_task("get_product_by_name")
+        if not current_count:
+            return
+        request_name = self._req_name("Get_Product_By_Name_", product_name)
         
+        payload = self._details_payload
+        payload["name"] = product_name
         self._retry_request(
-            request_func,
+            self._post,
+            self._path_details,
             request_name,
-            validators=[check_status_code(200), check_content_type()]
+            validators=self.VALIDATE_JSON,
+            data=dumps(payload),
+            headers=self.JSON_HEADERS
         )
 
     @tag("admin", "inventory")
     def update_product_stock(self):
-        task_name = "update_product_stock"
-        if not self._can_execute_task(task_name):
-            return
-
-        product = self.shared_data.get_random_product()
+        product = self._random_product()
         if not product or not product.get("name"):
             # logger.debug("No product found or product has no name for update_product_stock")
             return
         product_name = product.get("name")
-        new_stock = random.randint(0, 500) # Stock can be 0
-        current_count = self._increment_task_count(task_name)
-        request_name = f"Update_Product_Stock_{product_name[:20]} (#{current_count})"
-        
-        def request_func():
-            with self.client.patch(self._get_path("/products/stock"), json={"name": product_name, "stock": new_stock}, 
-                                 name=request_name, catch_response=True) as response:
-                return response
+        current_count = self._claim_task("update_product_stock")
+        if not current_count:
+            return
+        new_stock = self._next_stock() # Stock can be 0
+        request_name = self._req_name("Update_Product_Stock_", product_name)
         
+        payload = self._stock_payload
+        payload["name"] = product_name
+        payload["stock"] = new_stock
         self._retry_request(
-            request_func,
+            self._patch,
+            self._path_stock,
             request_name,
-            validators=[check_status_code(200), check_content_type()]
+            validators=self.VALIDATE_JSON,
+            data=dumps(payload),
+            headers=self.JSON_HEADERS
         )
 
     @tag("shopping", "purchase")
     def buy_product(self):
-        task_name = "buy_product"
-        if not self._can_execute_task(task_name):
-            return
-
-        product = self.shared_data.get_random_product()
+        product = self._random_product()
         if not product or not product.get("name"):
             # logger.debug("No product found or product has no name for buy_product")
             return
         product_name = product.get("name")
-        quantity = random.randint(1, 5)
-        current_count = self._increment_task_count(task_name)
-        request_name = f"Buy_Product_{product_name[:20]} (#{current_count})"
-        
-        def request_func():
-            with self.client.post(self._get_path("/products/buy"), json={"name": product_name, "quantity": quantity}, 
-                               name=request_name, catch_response=True) as response:
-                return response
+        current_count = self._claim_task("buy_product")
+        if not current_count:
+            return
+        quantity = self._next_quantity()
+        request_name = self._req_name("Buy_Product_", product_name)
         
+        payload = self._buy_payload
+        payload["name"] = product_name
+        payload["quantity"] = quantity
         # Allow 409 (out of stock) as a valid response for buy attempts
         response = self._retry_request(
-            request_func,
+            self._post,
+            self._path_buy,
             request_name,
-            validators=[check_status_code([200, 409]), check_content_type()] 
+            validators=self.VALIDATE_BUY,
+            data=dumps(payload),
+            headers=self.JSON_HEADERS
         )
         # Custom logic for buy_product response can be added here if needed
 
     @tag("health")
     def health_check(self):
-        task_name = "health_check"
-        if not self._can_execute_task(task_name):
+        current_count = self._claim_task("health_check")
+        if not current_count:
             return
         
-        current_count = self._increment_task_count(task_name)
-        request_name = f"Health_Check (#{current_count})"
+        request_name = self._req_name("Health_Check")
         
-        def request_func():
-            with self.client.get(self._get_path("/health"), name=request_name, catch_response=True) as response:
-                return response
-        
-        response = self._retry_request(
-            request_func,
+        self._retry_request(
+            self._get,
+            self._path_health,
             request_name,
-            validators=[check_status_code(200)]
+            validators=self.VALIDATE_STATUS,
+            on_failure=self._log_health_check_failure
         )
-        
-        if response and response.status_code != 200:
-            logger.error(f"Health check failed: {response.status_code} - {response.text}")
+    
+    def _log_health_check_failure(self, response):
+        # Only called once no retry is left, so a failure that a retry may still fix is not logged
+        logger.error("Health check failed: %s - %s", response.status_code, response.text)
 
 @events.init_command_line_parser.add_listener
 def _(parser):
@@ -316,6 +463,10 @@ def _(parser):
     # Any other truly global (non-SimulationUser specific) arguments 
     # could remain here or be added by other listeners.
 
+@events.test_start.add_listener
+def _(environment, **kwargs):
+    SimulationUser._TASKS = SimulationUser.build_tasks(SimulationUser.resolve_task_weights(environment))
+
 # Ensure telemetry is set up if enabled
 from src.telemetry.monitoring import setup_opentelemetry
 setup_opentelemetry()
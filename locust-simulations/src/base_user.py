@@ -1,102 +1,210 @@
 import os
+import sys
+import random
 import logging
-import time
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Tuple
 
-from locust import HttpUser, between
-from locust.clients import ResponseContextManager
+import gevent
+from gevent import spawn_later
+from locust import between
+from locust.runners import STATE_RUNNING, STATE_SPAWNING
+from locust.contrib.fasthttp import FastHttpUser, ResponseContextManager
 
-from src.utils.shared_data import SharedData
-from src.utils.http_validation import validate_response
-from src.utils.product_parser import parse_products_from_data
+from src.utils.http_validation import validate_response, PRODUCT_LIST_REQUIRED_FIELDS
+from src.utils.product_parser import extract_product_fields, ProductSchemaError
 
 # Configure logging
 logger = logging.getLogger("base_user")
 
-class BaseAPIUser(HttpUser):
+class BaseAPIUser(FastHttpUser):
     abstract = True
     
     wait_time = between(1, 3)
     
+    # geventhttpclient pool settings; sockets are kept alive and reused across tasks
+    network_timeout = 10.0
+    connection_timeout = 5.0
+    concurrency = 50
+    default_headers = {"Connection": "keep-alive"}
+    # The API never redirects, and retries are handled (and reported) by _retry_request
+    max_redirects = 0
+    max_retries = 0
+    
+    # Defaults for _retry_request, overridable with --retry-attempts and --retry-base-delay
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 10.0
+    # Scheduled retries run beside the user's own tasks; this caps how many can be pending at once
+    MAX_PENDING_RETRIES = 5
+    
+    # Product fields the tasks read back from SharedData; everything else is dropped on load
+    SHARED_PRODUCT_FIELDS = ("name", "category")
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.task_counts = {}
+        self._task_remaining = {}
         self.use_nginx_proxy = os.environ.get("USE_NGINX_PROXY", "false").lower() == "true"
         self.service_prefix = ""  # Default empty prefix, to be overridden by subclasses
         self.service_name = ""    # Default empty name, to be overridden by subclasses
+        self._path_cache = {}  # Resolved path per endpoint, see _get_path
+        self._retry_greenlets = set()  # Pending scheduled retries, killed in on_stop
+        self._rng = random.Random()  # Per-user generator for retry jitter and the task bodies
         
     def on_start(self):
-        pass
+        # Bind the client methods once; tasks call them on every request
+        self._get = self.client.get
+        self._post = self.client.post
+        self._patch = self.client.patch
+        parsed_options = getattr(self.environment, "parsed_options", None)
+        self._retry_attempts = getattr(parsed_options, "retry_attempts", self.RETRY_ATTEMPTS)
+        self._retry_base_delay = getattr(parsed_options, "retry_base_delay", self.RETRY_BASE_DELAY)
+    
+    def on_stop(self):
+        # Retries still waiting must not fire once the user has been stopped
+        if self._retry_greenlets:
+            gevent.killall(list(self._retry_greenlets), block=False)
+            self._retry_greenlets.clear()
     
     def _get_path(self, endpoint):
-        if self.use_nginx_proxy and self.service_prefix:
-            # For nginx proxy, prepend /prefix/
-            return f"/{self.service_prefix}{endpoint}"
-        # Direct access
-        return endpoint
+        # The proxy settings are fixed once the user is running, so each endpoint is resolved once
+        path = self._path_cache.get(endpoint)
+        if path is None:
+            if self.use_nginx_proxy and self.service_prefix:
+                # For nginx proxy, prepend /prefix/
+                path = f"/{self.service_prefix}{endpoint}"
+            else:
+                # Direct access
+                path = endpoint
+            self._path_cache[endpoint] = path
+        return path
     
-    def _can_execute_task(self, task_name):
-        max_executions_arg = f"max_{task_name}"
-        max_executions = getattr(self.environment.parsed_options, max_executions_arg, -1) if hasattr(self.environment, "parsed_options") else -1
-        
-        if max_executions == 0:
-            return False
-        if max_executions < 0:
-            return True
-        current_count = self.task_counts.get(task_name, 0)
-        return current_count < max_executions
+    def _load_task_limits(self, task_names):
+        # The --max-* options are fixed for the run, so they are turned once into a count of runs
+        # left per task; an unlimited task (-1) gets sys.maxsize so the checks need no special case
+        parsed_options = getattr(self.environment, "parsed_options", None)
+        for task_name in task_names:
+            count = self.task_counts.setdefault(task_name, 0)
+            max_executions = getattr(parsed_options, f"max_{task_name}", -1)
+            self._task_remaining[task_name] = sys.maxsize if max_executions < 0 else max(max_executions - count, 0)
     
-    def _increment_task_count(self, task_name):
-        self.task_counts[task_name] = self.task_counts.get(task_name, 0) + 1
-        return self.task_counts[task_name]
+    def _claim_task(self, task_name):
+        # Limit check and increment in one pass; returns the new count, or 0 once the limit is hit
+        remaining = self._task_remaining[task_name]
+        if not remaining:
+            return 0
+        self._task_remaining[task_name] = remaining - 1
+        count = self.task_counts[task_name] + 1
+        self.task_counts[task_name] = count
+        return count
     
-    def _extract_products(self, response: ResponseContextManager) -> List[Dict[str, Any]]:
+    def _extract_products(self, response: ResponseContextManager, fields: Tuple[str, ...],
+                          required_fields: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
         try:
-            json_data = response.json()
-            return parse_products_from_data(json_data, logger)
+            return extract_product_fields(response.content, fields, required_fields)
+        except ProductSchemaError as e:
+            # Not retried: the service answers with the same product shape every time
+            logger.warning("Products list schema validation error: %s - Response text: %s", e, response.content[:500].decode("utf-8", "replace"))
+            response.failure(f"Products list schema validation error: {e}")
+            return []
         except Exception as e:
-            logger.error(f"Error extracting products: {e} - Response text: {response.text[:500]}")
+            logger.error("Error extracting products: %s - Response text: %s", e, response.content[:500].decode("utf-8", "replace"))
             response.failure(f"Failed to parse JSON response: {e}")
             return []
     
-    def _retry_request(self, request_func, name, validators=None, max_retries=3):
-        retry_delay = 1
+    def _next_retry_delay(self, previous_delay):
+        # Decorrelated jitter: each delay is drawn between the base delay and three times the
+        # previous one, so users that failed together do not retry in lockstep
+        base = self._retry_base_delay
+        if previous_delay is None:
+            return self._rng.uniform(base, base * 3)
+        return min(self.RETRY_MAX_DELAY, self._rng.uniform(base, previous_delay * 3))
+    
+    def _schedule_retry(self, previous_delay, request_kwargs, *retry_args):
+        # Kept out of _retry_request so a request that needs no retry builds no closure or
+        # argument tuple for one. Returns the delay, or None if too many retries are pending
+        if len(self._retry_greenlets) >= self.MAX_PENDING_RETRIES:
+            return None
+        delay = self._next_retry_delay(previous_delay)
+        greenlet = spawn_later(delay, self._run_retry, *retry_args, delay, **request_kwargs)
+        self._retry_greenlets.add(greenlet)
+        greenlet.link(self._retry_greenlets.discard)
+        return delay
+    
+    def _run_retry(self, *args, **kwargs):
+        # The test may have been stopped or be ramping down since the retry was scheduled
+        runner = self.environment.runner
+        if runner is None or runner.state not in (STATE_RUNNING, STATE_SPAWNING):
+            return None
+        return self._retry_request(*args, **kwargs)
+    
+    def _retry_request(self, request_method, url, name, validators=None, max_retries=None, attempt=0,
+                       on_success=None, on_failure=None, previous_delay=None, **request_kwargs):
+        # request_method is one of the pre-bound client methods (self._get, self._post, ...); it is
+        # called with catch_response=True and the checks below run inside the response's with-block
+        # so failure()/success() reach Locust's statistics. request_kwargs (data, params, headers)
+        # are passed through unchanged, including to retries, so they must not be mutated later.
+        # on_success, if given, handles a validated response in the same block (e.g. extracting
+        # data from the body that was just checked); on_failure, if given, is called with a failed
+        # response only when no retry follows it. Retries are scheduled on a separate greenlet
+        # so the user keeps running its tasks instead of idling through the backoff delay. A retry
+        # re-attempts an execution that was already claimed, so it does not count against the
+        # task's execution limit; pending retries die with the user (see on_stop).
+        if max_retries is None:
+            max_retries = self._retry_attempts
+        can_retry = attempt < max_retries - 1
         
-        for attempt in range(max_retries):
-            try:
-                response = request_func()
-                
-                if 500 <= response.status_code < 600:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"{name} failed with status {response.status_code}, retrying in {retry_delay}s ({attempt+1}/{max_retries})")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-                        continue
+        try:
+            with request_method(url, name=name, catch_response=True, **request_kwargs) as response:
+                if 500 <= response.status_code < 600 and can_retry:
+                    delay = self._schedule_retry(previous_delay, request_kwargs, request_method, url, name,
+                                                 validators, max_retries, attempt + 1, on_success, on_failure)
+                    if delay is None:
+                        logger.warning("%s failed with status %s, too many retries pending, not retrying", name, response.status_code)
+                        if on_failure is not None:
+                            on_failure(response)
+                    else:
+                        logger.warning("%s failed with status %s, retrying in %.2fs (%s/%s)", name, response.status_code, delay, attempt+1, max_retries)
+                    return response
                 
                 if validators:
-                    valid = validate_response(response, validators)
-                    if not valid and attempt < max_retries - 1:
-                        logger.warning(f"{name} validation failed, retrying in {retry_delay}s ({attempt+1}/{max_retries})")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-                        continue
+                    if not validate_response(response, validators):
+                        # Keep the more specific result: a check may already have called failure()
+                        # with its reason, and an error status is reported by the context manager
+                        if response._manual_result is None and response.status_code < 400:
+                            response.failure(f"{name} failed validation")
+                        delay = None
+                        if can_retry:
+                            delay = self._schedule_retry(previous_delay, request_kwargs, request_method, url, name,
+                                                         validators, max_retries, attempt + 1, on_success, on_failure)
+                            if delay is None:
+                                logger.warning("%s validation failed, too many retries pending, not retrying", name)
+                            else:
+                                logger.warning("%s validation failed, retrying in %.2fs (%s/%s)", name, delay, attempt+1, max_retries)
+                        if delay is None and on_failure is not None:
+                            on_failure(response)
+                        return response
+                    # Validators decide what counts as success, e.g. an expected 409
+                    response.success()
                 
+                if on_success is not None:
+                    on_success(response)
                 return response
-            
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.error(f"Error during {name} (attempt {attempt+1}): {str(e)}")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    logger.error(f"Final error during {name} after {max_retries} attempts: {str(e)}")
-        
-        return None
+        except Exception as e:
+            if can_retry:
+                logger.error("Error during %s (attempt %s): %s", name, attempt+1, e)
+                self._schedule_retry(previous_delay, request_kwargs, request_method, url, name,
+                                     validators, max_retries, attempt + 1, on_success, on_failure)
+            else:
+                logger.error("Final error during %s after %s attempts: %s", name, max_retries, e)
+            return None
     
-    def process_products_response(self, response, update_shared_data=True):
-        if response and response.status_code == 200:
-            products = self._extract_products(response)
-            if products and update_shared_data:
+    def process_products_response(self, response):
+        # Runs inside the response's with-block (see _retry_request), so a malformed body is
+        # reported as a failure of that request
+        if response is not None and response.status_code == 200:
+            products = self._extract_products(response, self.SHARED_PRODUCT_FIELDS, PRODUCT_LIST_REQUIRED_FIELDS)
+            if products:
                 self.shared_data.update_products(products)
             return products
-        return None 
\ No newline at end of file
+        return None
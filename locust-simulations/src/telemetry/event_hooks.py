@@ -2,7 +2,10 @@ import logging
 import time
 import csv
 import os
+from collections import deque
 from typing import Dict, Any
+
+import gevent
 from locust import events
 
 logger = logging.getLogger("event_hooks")
@@ -17,56 +20,181 @@ custom_stats = {
     "non_existent_product_requests": 0
 }
 
-# Request response times by name
-request_response_times = {}
+class ResponseTimeStats:
+    """
+    Running response time statistics for one request name. Samples are counted in rounded
+    buckets (much like Locust's own statistics), so memory stays bounded however many
+    requests are recorded.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+    
+    def record(self, response_time):
+        self.count += 1
+        self.total += response_time
+        if self.min is None or response_time < self.min:
+            self.min = response_time
+        if self.max is None or response_time > self.max:
+            self.max = response_time
+        # 0.86 becomes 0.9, 14.7 becomes 15, 147 becomes 150, 1432 becomes 1400, 58760 becomes 59000
+        if response_time < 10:
+            bucket = round(response_time, 1)
+        elif response_time < 100:
+            bucket = round(response_time)
+        elif response_time < 1000:
+            bucket = round(response_time, -1)
+        elif response_time < 10000:
+            bucket = round(response_time, -2)
+        else:
+            bucket = round(response_time, -3)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+    
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else 0
+    
+    @property
+    def median(self):
+        # Upper median, to the precision of the buckets
+        target = self.count // 2
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > target:
+                return bucket
+        return None
+
+# Response time statistics by request name
+request_response_times: Dict[str, ResponseTimeStats] = {}
+
+# Request samples buffered by on_request and folded into the statistics by a
+# background greenlet, so the per-request listener only does an append
+pending_requests = deque()
+flush_interval = 1.0  # Seconds between flushes
+_flusher = None
+
+# Requests recorded since the test started, counted per flush
+_total_requests = 0
+
+# Report files are written through a large buffer so rows reach the disk in a few writes
+CSV_BUFFER_SIZE = 1 << 20
+
+# Flag to track if the listeners are registered; registering twice would count every request twice
+_handlers_registered = False
+
+def _count_purchase(exception, status_code):
+    if exception or (status_code is not None and status_code != 200):
+        custom_stats["failed_purchases"] += 1
+        # Check if it's specifically out of stock
+        if status_code == 409:
+            custom_stats["out_of_stock"] += 1
+    else:
+        custom_stats["successful_purchases"] += 1
+
+def _count_stock_update(exception, status_code):
+    if not exception and status_code == 200:
+        custom_stats["stock_updates"] += 1
+
+def _count_product_view(exception, status_code):
+    if not exception and status_code == 200:
+        custom_stats["product_views"] += 1
+    elif status_code == 404:
+        custom_stats["non_existent_product_requests"] += 1
+
+# Custom metric handlers by request name fragment, checked in order
+_METRIC_HANDLERS = (
+    ("Buy_Product", _count_purchase),
+    ("Update_Product_Stock", _count_stock_update),
+    ("Get_Product_Details", _count_product_view),
+)
+
+# Handler resolved per request name (None when no metric applies). Request names are bounded, so
+# the substring checks run once per name rather than once per request
+_handlers_by_name = {}
+
+def _metric_handler(name):
+    try:
+        return _handlers_by_name[name]
+    except KeyError:
+        handler = next((h for fragment, h in _METRIC_HANDLERS if fragment in name), None)
+        _handlers_by_name[name] = handler
+        return handler
+
+def _record_request(name, response_time, exception, status_code):
+    # Track response times
+    if response_time is not None:
+        stats = request_response_times.get(name)
+        if stats is None:
+            stats = request_response_times[name] = ResponseTimeStats()
+        stats.record(response_time)
+    
+    # Track custom metrics based on request name and response
+    handler = _metric_handler(name)
+    if handler is not None:
+        handler(exception, status_code)
+
+def flush_pending_requests():
+    global _total_requests
+    pop = pending_requests.popleft
+    count = len(pending_requests)
+    for _ in range(count):
+        _record_request(*pop())
+    _total_requests += count
+
+def _flush_loop():
+    while True:
+        gevent.sleep(flush_interval)
+        flush_pending_requests()
+        log_periodic_stats()
 
 def register_stats_event_handlers():
+    global _handlers_registered
+    
+    # Only register once
+    if _handlers_registered:
+        return
+    _handlers_registered = True
     
     @events.request.add_listener
     def on_request(request_type, name, response_time, response_length, exception, **kwargs):
-        # Track response times
-        if name not in request_response_times:
-            request_response_times[name] = []
-        request_response_times[name].append(response_time)
-        
-        # Track custom metrics based on request name and response
         response = kwargs.get("response")
-        
-        if "Buy_Product" in name:
-            if exception or (response and response.status_code != 200):
-                custom_stats["failed_purchases"] += 1
-                # Check if it's specifically out of stock
-                if response and response.status_code == 409:
-                    custom_stats["out_of_stock"] += 1
-            else:
-                custom_stats["successful_purchases"] += 1
-                
-        elif "Update_Product_Stock" in name and not exception and response and response.status_code == 200:
-            custom_stats["stock_updates"] += 1
-            
-        elif "Get_Product_Details" in name and not exception and response and response.status_code == 200:
-            custom_stats["product_views"] += 1
-            
-        elif "Get_Product_Details" in name and response and response.status_code == 404:
-            custom_stats["non_existent_product_requests"] += 1
+        status_code = response.status_code if response is not None else None
+        pending_requests.append((name, response_time, exception, status_code))
     
     @events.test_start.add_listener
     def on_test_start(environment, **kwargs):
+        global _flusher, _total_requests
+        
         # Reset custom stats
         for key in custom_stats:
             custom_stats[key] = 0
             
         # Reset response times
         request_response_times.clear()
+        pending_requests.clear()
+        _handlers_by_name.clear()
+        _total_requests = 0
+        
+        if _flusher is None or _flusher.dead:
+            _flusher = gevent.spawn(_flush_loop)
         
         logger.info("Test started, statistics reset")
     
     @events.test_stop.add_listener
     def on_test_stop(environment, **kwargs):
+        if _flusher is not None:
+            _flusher.kill()
+        flush_pending_requests()
+        
         # Print custom statistics to console
         logger.info("\n=== Custom Statistics ===")
         for key, value in custom_stats.items():
-            logger.info(f"{key}: {value}")
+            logger.info("%s: %s", key, value)
         
         # Generate CSV report
         try:
@@ -77,45 +205,41 @@ def register_stats_event_handlers():
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             
             # Save custom statistics
-            with open(f"{results_dir}/custom_stats_{timestamp}.csv", "w", newline="") as f:
+            with open(f"{results_dir}/custom_stats_{timestamp}.csv", "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(["Metric", "Value"])
-                for key, value in custom_stats.items():
-                    writer.writerow([key, value])
+                writer.writerows(custom_stats.items())
             
             # Save response time statistics
-            with open(f"{results_dir}/response_times_{timestamp}.csv", "w", newline="") as f:
+            with open(f"{results_dir}/response_times_{timestamp}.csv", "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(["Request", "Min", "Max", "Avg", "Median", "Count"])
-                for name, times in request_response_times.items():
-                    if times:
-                        times.sort()
-                        min_time = min(times)
-                        max_time = max(times)
-                        avg_time = sum(times) / len(times)
-                        median_time = times[len(times) // 2]
-                        writer.writerow([name, min_time, max_time, avg_time, median_time, len(times)])
+                writer.writerows(
+                    (name, stats.min, stats.max, stats.avg, stats.median, stats.count)
+                    for name, stats in request_response_times.items()
+                    if stats.count
+                )
             
-            logger.info(f"Reports saved to {results_dir}/")
+            logger.info("Reports saved to %s/", results_dir)
             
         except Exception as e:
-            logger.error(f"Error generating reports: {e}")
+            logger.error("Error generating reports: %s", e)
 
 # Additional custom event handlers
 request_count_threshold = 1000  # Threshold to log stats during test
 last_stats_time = 0
 stats_interval = 60  # Log stats every 60 seconds
 
-@events.request.add_listener
-def log_periodic_stats(request_type, name, response_time, response_length, exception, **kwargs):
+def log_periodic_stats():
+    # Called by the flush loop after each flush rather than per request; the request total is
+    # kept as a running count by flush_pending_requests
     global last_stats_time
     
-    current_time = time.time()
+    current_time = time.monotonic()
     if current_time - last_stats_time >= stats_interval:
         last_stats_time = current_time
         
-        total_requests = sum(len(times) for times in request_response_times.values())
-        if total_requests >= request_count_threshold:
-            logger.info(f"\n=== Periodic Stats Update ({total_requests} requests) ===")
+        if _total_requests >= request_count_threshold:
+            logger.info("\n=== Periodic Stats Update (%s requests) ===", _total_requests)
             for key, value in custom_stats.items():
-                logger.info(f"{key}: {value}") 
\ No newline at end of file
+                logger.info("%s: %s", key, value)
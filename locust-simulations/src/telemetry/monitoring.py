@@ -16,6 +16,46 @@ try:
     from opentelemetry.sdk.trace.export import BatchSpanProcessor
     from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
     from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+    from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, Sampler, TraceIdRatioBased
+    
+    # Share of request spans exported (OTEL_SAMPLE_RATIO); the test start/stop spans are always kept
+    DEFAULT_SAMPLE_RATIO = 0.01
+    LIFECYCLE_SPAN_NAMES = frozenset(("locust_test_start", "locust_test_stop"))
+    
+    # Batch export defaults sized for request-rate span volumes; the standard OTEL_BSP_* variables
+    # still take precedence
+    BSP_DEFAULTS = {
+        "OTEL_BSP_MAX_QUEUE_SIZE": ("max_queue_size", 8192),
+        "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": ("max_export_batch_size", 1024),
+        "OTEL_BSP_SCHEDULE_DELAY": ("schedule_delay_millis", 2000),
+    }
+    
+    class RequestRatioSampler(Sampler):
+        """
+        Samples request spans at a fixed ratio (respecting a sampled parent) while always keeping
+        the test lifecycle spans.
+        """
+        
+        def __init__(self, ratio):
+            self._ratio_sampler = ParentBased(TraceIdRatioBased(ratio))
+        
+        def should_sample(self, parent_context, trace_id, name, *args, **kwargs):
+            sampler = ALWAYS_ON if name in LIFECYCLE_SPAN_NAMES else self._ratio_sampler
+            return sampler.should_sample(parent_context, trace_id, name, *args, **kwargs)
+        
+        def get_description(self):
+            return f"RequestRatioSampler{{{self._ratio_sampler.get_description()}}}"
+    
+    def _sample_ratio():
+        value = os.environ.get("OTEL_SAMPLE_RATIO")
+        if value is None:
+            return DEFAULT_SAMPLE_RATIO
+        try:
+            ratio = float(value)
+        except ValueError:
+            logger.warning("Invalid OTEL_SAMPLE_RATIO '%s', using %s", value, DEFAULT_SAMPLE_RATIO)
+            return DEFAULT_SAMPLE_RATIO
+        return min(max(ratio, 0.0), 1.0)
     
     def setup_opentelemetry():
         global otel_initialized
@@ -45,29 +85,48 @@ try:
             })
             
             # Set up tracer provider
-            tracer_provider = TracerProvider(resource=resource)
+            sample_ratio = _sample_ratio()
+            tracer_provider = TracerProvider(resource=resource, sampler=RequestRatioSampler(sample_ratio))
             trace.set_tracer_provider(tracer_provider)
             
-            # Configure exporter
+            # Configure exporter; a None batch setting makes the processor read its OTEL_BSP_* variable
             otlp_exporter = OTLPSpanExporter(endpoint=otel_endpoint, insecure=True)
-            span_processor = BatchSpanProcessor(otlp_exporter)
+            batch_settings = {
+                setting: None if env_var in os.environ else default
+                for env_var, (setting, default) in BSP_DEFAULTS.items()
+            }
+            # BatchSpanProcessor rejects a batch larger than the queue, so the default batch size
+            # must not exceed a smaller queue set through the environment
+            if batch_settings["max_export_batch_size"] is not None and batch_settings["max_queue_size"] is None:
+                try:
+                    queue_size = int(os.environ["OTEL_BSP_MAX_QUEUE_SIZE"])
+                except ValueError:
+                    queue_size = None  # The SDK warns and falls back to its own default
+                if queue_size is not None and queue_size > 0:
+                    batch_settings["max_export_batch_size"] = min(batch_settings["max_export_batch_size"], queue_size)
+            span_processor = BatchSpanProcessor(otlp_exporter, **batch_settings)
             tracer_provider.add_span_processor(span_processor)
             
-            logger.info(f"OpenTelemetry initialized for service '{service_name}' with endpoint: {otel_endpoint}")
+            logger.info("OpenTelemetry initialized for service '%s' with endpoint: %s (request sample ratio %s)", service_name, otel_endpoint, sample_ratio)
             otel_initialized = True
             
-            # Register Locust event handlers for telemetry
-            _register_telemetry_handlers()
+            # Register Locust event handlers for telemetry; with a zero ratio no request span
+            # would ever be kept, so the per-request listener is left out entirely
+            _register_telemetry_handlers(record_requests=sample_ratio > 0)
             
         except Exception as e:
-            logger.error(f"Failed to initialize OpenTelemetry: {e}")
+            logger.error("Failed to initialize OpenTelemetry: %s", e)
     
-    def _register_telemetry_handlers():
+    def _register_telemetry_handlers(record_requests=True):
         tracer = trace.get_tracer(__name__)
         
-        @events.request.add_listener
         def on_request(request_type, name, response_time, response_length, exception, **kwargs):
-            with tracer.start_as_current_span(f"{request_type} {name}") as span:
+            # The span is never made current (nothing runs inside it), and one the sampler
+            # dropped is non-recording: its end() is a no-op, so it is simply discarded
+            span = tracer.start_span(f"{request_type} {name}")
+            if not span.is_recording():
+                return
+            try:
                 span.set_attribute("http.method", request_type)
                 span.set_attribute("http.url", name)
                 span.set_attribute("http.response_time_ms", response_time)
@@ -76,9 +135,15 @@ try:
                     span.set_attribute("error", True)
                     span.set_attribute("error.message", str(exception))
                 else:
+                    # FastResponse is falsy for an empty body, so test for presence explicitly
                     response = kwargs.get("response")
-                    if response:
+                    if response is not None:
                         span.set_attribute("http.status_code", response.status_code)
+            finally:
+                span.end()
+        
+        if record_requests:
+            events.request.add_listener(on_request)
         
         @events.test_start.add_listener
         def on_test_start(environment, **kwargs):
@@ -118,4 +183,5 @@ except ImportError:
     logger.warning("OpenTelemetry packages not installed, telemetry features disabled")
     
     def setup_opentelemetry():
-        logger.warning("OpenTelemetry packages not installed, telemetry features disabled") 
\ No newline at end of file
+        # Already reported once at import time
+        pass 
\ No newline at end of file
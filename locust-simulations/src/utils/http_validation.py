@@ -1,39 +1,47 @@
 import logging
-from typing import List, Dict, Any, Callable, Optional, Union
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence, Union
+
 # import json # Already commented/removed, ensure it stays that way if present
 
 # Remove the problematic relative import of BaseAPIUser
 # from ..base_user import BaseAPIUser # REMOVE THIS LINE
 
 # Import the new utility function
+from .json_codec import parse_json
 from .product_parser import parse_products_from_data # Assuming product_parser.py is in the same 'utils' directory
 
 logger = logging.getLogger("validators")
 
-def validate_response(response, checks: List[Callable]) -> bool:
-    success = True
+# Fields every product in a list response must carry (checked on the first product)
+PRODUCT_LIST_REQUIRED_FIELDS = ("name", "description", "price")
+
+def validate_response(response, checks: Sequence[Callable]) -> bool:
+    # Stops at the first failing check, so e.g. a bad status code skips the body checks
     for check in checks:
         try:
-            check_result = check(response)
-            if not check_result:
-                success = False
+            if not check(response):
+                return False
         except Exception as e:
-            logger.error(f"Validation error: {e}")
-            success = False
-    return success
+            logger.error("Validation error: %s", e)
+            return False
+    return True
 
-def check_status_code(expected_codes: Union[int, List[int]]) -> Callable:
-    def _check(response) -> bool:
-        if isinstance(expected_codes, list):
-            # Handle a list of expected codes
-            if response.status_code not in expected_codes:
-                logger.warning(f"Expected status to be one of {expected_codes}, got {response.status_code}")
-                return False
-        else:
+def check_status_code(expected_codes: Union[int, Iterable[int]]) -> Callable:
+    if isinstance(expected_codes, int):
+        def _check(response) -> bool:
             # Handle a single expected code (integer)
             if response.status_code != expected_codes:
-                logger.warning(f"Expected status {expected_codes}, got {response.status_code}")
+                logger.warning("Expected status %s, got %s", expected_codes, response.status_code)
                 return False
+            return True
+        return _check
+    
+    # Handle several expected codes (list, tuple, ...); a frozenset makes the per-response test a hash lookup
+    allowed_codes = frozenset(expected_codes)
+    def _check(response) -> bool:
+        if response.status_code not in allowed_codes:
+            logger.warning("Expected status to be one of %s, got %s", sorted(allowed_codes), response.status_code)
+            return False
         return True
     return _check
 
@@ -41,7 +49,7 @@ def check_content_type(expected_type: str = "application/json") -> Callable:
     def _check(response) -> bool:
         content_type = response.headers.get('Content-Type', '')
         if expected_type not in content_type:
-            logger.warning(f"Expected content type {expected_type}, got {content_type}")
+            logger.warning("Expected content type %s, got %s", expected_type, content_type)
             return False
         return True
     return _check
@@ -49,33 +57,33 @@ def check_content_type(expected_type: str = "application/json") -> Callable:
 def check_json_contains(expected_fields: List[str]) -> Callable:
     def _check(response) -> bool:
         try:
-            data = response.json()
+            data = parse_json(response)
             for field in expected_fields:
                 if field not in data:
-                    logger.warning(f"Expected field '{field}' not found in response")
+                    logger.warning("Expected field '%s' not found in response", field)
                     return False
             return True
         except Exception as e:
-            logger.warning(f"JSON parsing error: {e}")
+            logger.warning("JSON parsing error: %s", e)
             return False
     return _check
 
 def check_product_schema(response) -> bool:
     try:
-        product = response.json()
+        product = parse_json(response)
         required_fields = ["name", "description", "price", "stock", "category"]
         for field in required_fields:
             if field not in product:
-                logger.warning(f"Product missing required field: {field}")
+                logger.warning("Product missing required field: %s", field)
                 return False
         return True
     except Exception as e:
-        logger.warning(f"Product schema validation error: {e}")
+        logger.warning("Product schema validation error: %s", e)
         return False
 
 def check_products_list_schema(response) -> bool:
     try:
-        json_payload = response.json()
+        json_payload = parse_json(response)
         # Use the imported utility function to parse products
         products = parse_products_from_data(json_payload, logger) 
         
@@ -88,19 +96,18 @@ def check_products_list_schema(response) -> bool:
         
         first_product = products[0]
         if not isinstance(first_product, dict):
-            logger.warning(f"Product in list is not a dictionary. Got: {type(first_product)}")
+            logger.warning("Product in list is not a dictionary. Got: %s", type(first_product))
             response.failure("Product in list is not a dictionary.")
             return False
         
-        required_fields = ["name", "description", "price"]
-        for field in required_fields:
+        for field in PRODUCT_LIST_REQUIRED_FIELDS:
             if field not in first_product:
-                logger.warning(f"Product list item missing required field: '{field}'. Product: {first_product}")
+                logger.warning("Product list item missing required field: '%s'. Product: %s", field, first_product)
                 response.failure(f"Product list item missing required field: '{field}'")
                 return False
         return True
         
     except Exception as e:
-        logger.warning(f"Products list schema validation error: {e} - Response text: {response.text[:500]}")
+        logger.warning("Products list schema validation error: %s - Response text: %s", e, response.content[:500].decode("utf-8", "replace"))
         response.failure(f"Products list schema validation error: {e}")
         return False 
\ No newline at end of file
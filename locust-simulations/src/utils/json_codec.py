@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+# orjson is optional; without it the stdlib json module is used with the same bytes-in/bytes-out API
+try:
+    import orjson
+
+    loads = orjson.loads
+    dumps = orjson.dumps
+except ImportError:
+    orjson = None
+
+    def loads(content) -> Any:
+        return json.loads(content)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def parse_json(response) -> Any:
+    """
+    Decodes a response body straight from its raw bytes, skipping the text/charset
+    handling that response.json() goes through.
+    """
+    return loads(response.content)
@@ -1,31 +1,106 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from .json_codec import loads
+
+# simdjson is optional; without it extract_product_fields falls back to the default JSON decoder
+try:
+    import simdjson
+    _simdjson_parser = simdjson.Parser()  # Reused across calls so its internal buffers are kept
+except ImportError:
+    simdjson = None
+
+ProductsParser = Callable[[Any], List[Dict[str, Any]]]
+
+class ProductSchemaError(ValueError):
+    """Raised when a products payload parses but its products lack a required field."""
+
+def _parse_products_list(products: List[Any]) -> List[Dict[str, Any]]:
+    # Ensure all items are dicts (basic check); JSON decoders only build plain dicts, so an exact
+    # type check is enough and skips isinstance's subclass walk
+    return [p for p in products if type(p) is dict]
+
+def _parse_products_dict(products: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Convert dictionary of products (keyed by name/id) to a list, keeping product-like entries only
+    return [p for p in products.values() if type(p) is dict and "name" in p]
+
+def _parse_wrapped_products_list(json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _parse_products_list(json_data["data"])
+
+def _parse_wrapped_products_dict(json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _parse_products_dict(json_data["data"])
+
+def select_products_parser(json_data: Any) -> Optional[ProductsParser]:
+    """
+    Returns the parser specialized for the shape of json_data, or None if the shape is not recognized.
+    An endpoint always answers with the same shape, so callers can cache the result per endpoint.
+    """
+    if isinstance(json_data, dict):
+        # Handle potential wrapper object (e.g., {"status": ..., "data": ...})
+        if "data" in json_data:
+            data = json_data["data"]
+            if isinstance(data, list):
+                return _parse_wrapped_products_list
+            if isinstance(data, dict):
+                return _parse_wrapped_products_dict
+            return None
+        return _parse_products_dict
+    if isinstance(json_data, list):
+        return _parse_products_list
+    return None
 
 def parse_products_from_data(json_data: Any, logger_instance: logging.Logger) -> List[Dict[str, Any]]:
     """
     Parses product data from various raw JSON structures.
     """
-    processed_data = json_data
-
-    # Handle potential wrapper object (e.g., {"status": ..., "data": ...})
-    if isinstance(json_data, dict) and "data" in json_data:
-        # One could potentially check json_data["status"] here if needed
-        processed_data = json_data["data"]
-    
-    if isinstance(processed_data, list):
-        # Ensure all items are dicts (basic check)
-        return [p for p in processed_data if isinstance(p, dict)]
-
-    if isinstance(processed_data, dict):
-        # Convert dictionary of products (keyed by name/id) to a list
-        products_list = []
-        for _key, product_data in processed_data.items(): # _key is unused
-            if isinstance(product_data, dict) and "name" in product_data: # Basic check for product-like structure
-                products_list.append(product_data)
-            # Example from original SimulationUser._extract_products, can be re-added if error key is expected
-            # elif _key == "error" and not isinstance(product_data, dict):
-            #    logger_instance.warning(f"API error in product data: {product_data}")
-        return products_list
-    
-    logger_instance.warning(f"Unexpected product data structure after processing: {type(processed_data)}")
-    return [] 
\ No newline at end of file
+    parser = select_products_parser(json_data)
+    if parser is None:
+        processed_data = json_data["data"] if isinstance(json_data, dict) else json_data
+        logger_instance.warning("Unexpected product data structure after processing: %s", type(processed_data))
+        return []
+    return parser(json_data)
+
+
+def _product_items(json_data: Any, object_type: type):
+    # Index by key rather than .values(): simdjson's values() would materialize every product
+    items = (json_data[key] for key in json_data) if isinstance(json_data, object_type) else json_data
+    return (item for item in items if type(item) is object_type and "name" in item)
+
+def _first_product(json_data: Any, object_type: type):
+    # The product the list schema check looks at, picked as parse_products_from_data does: the first
+    # object of a list even without a name, or the first named entry of an object keyed by name
+    if isinstance(json_data, object_type):
+        return next(_product_items(json_data, object_type), None)
+    return next((item for item in json_data if type(item) is object_type), None)
+
+def _project_products(json_data: Any, fields: Tuple[str, ...], object_type: type,
+                      required_fields: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    if isinstance(json_data, object_type) and "data" in json_data:
+        json_data = json_data["data"]
+    if required_fields:
+        # Schema check on the first product only, done here so the payload is parsed once
+        first_product = _first_product(json_data, object_type)
+        if first_product is not None:
+            for field in required_fields:
+                if field not in first_product:
+                    raise ProductSchemaError(f"Product list item missing required field: '{field}'")
+    return [
+        {field: item[field] for field in fields if field in item}
+        for item in _product_items(json_data, object_type)
+    ]
+
+def extract_product_fields(content: bytes, fields: Tuple[str, ...],
+                           required_fields: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Parses a raw products payload keeping only the given fields of each named product.
+    With simdjson the document is read lazily, so unused fields never become Python objects.
+    Raises ProductSchemaError if the first product lacks any of required_fields.
+    """
+    if simdjson is None:
+        return _project_products(loads(content), fields, dict, required_fields)
+    try:
+        document = _simdjson_parser.parse(content)
+    except RuntimeError:
+        # The shared parser is still referenced by a live document (e.g. held by a traceback)
+        document = simdjson.Parser().parse(content)
+    return _project_products(document, fields, simdjson.Object, required_fields)
@@ -2,7 +2,7 @@ import threading
 import random
 import time
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger("shared_data")
 
@@ -10,38 +10,50 @@ class SharedData:
     
     def __init__(self):
         self._lock = threading.RLock()
-        self._products = []
+        # Immutable snapshot, replaced wholesale on update so readers never need the lock
+        self._products: Tuple[Dict[str, Any], ...] = ()
         self._categories = set()
         self._last_product_update = 0
+        self._version = 0
+    
+    @property
+    def version(self) -> int:
+        # Bumped on every update_products call so callers can memoize derived data
+        return self._version
     
     def update_products(self, products: List[Dict[str, Any]]) -> None:
         with self._lock:
-            self._products = products
+            self._products = tuple(products)
             self._last_product_update = time.time()
+            self._version += 1
             
             # Extract categories
             for product in products:
                 if "category" in product and product["category"]:
                     self._categories.add(product["category"])
             
-            logger.debug(f"Updated shared products: {len(products)} products, {len(self._categories)} categories")
+            logger.debug("Updated shared products: %d products, %d categories", len(products), len(self._categories))
     
-    def get_products(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            return self._products.copy()
+    def get_products(self) -> Tuple[Dict[str, Any], ...]:
+        return self._products
+    
+    def get_snapshot(self) -> Tuple[int, Tuple[Dict[str, Any], ...]]:
+        # Version is read first; update_products replaces the products before bumping it, so the
+        # products returned are never older than the version
+        version = self._version
+        return version, self._products
     
     def get_random_product(self) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            if not self._products:
-                return None
-            return random.choice(self._products)
+        products = self._products
+        if not products:
+            return None
+        return random.choice(products)
     
     def get_product_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            for product in self._products:
-                if product.get("name") == name:
-                    return product
-            return None
+        for product in self._products:
+            if product.get("name") == name:
+                return product
+        return None
     
     def get_categories(self) -> List[str]:
         with self._lock:
@@ -1,20 +1,13 @@
 package handlers
 
 import (
-	"log/slog"
 	"net/http"
 
 	"github.com/gofiber/fiber/v2"
 )
 
 func (h *ProductHandler) HealthCheck(c *fiber.Ctx) error {
-	ctx := c.UserContext()
-
-	// Get request ID
-
-	h.logger.DebugContext(ctx, "Health check requested",
-		slog.String("component", "product_handler"),
-		slog.String("operation", "health_check"))
+	// Not logged: load balancers and the load generator probe this at high frequency
 
 	// Create response with request ID
 	response := fiber.Map{
@@ -42,8 +42,7 @@ func (r *productRepository) GetAll(ctx context.Context) (productsSlice []models.
 		slog.String("component", "product_repository"),
 		slog.String("operation", "read_from_database"))
 
-	var productsMap map[string]models.Product
-	err := r.database.Read(ctx, &productsMap)
+	productsMap, err := r.loadProducts(ctx)
 	if err != nil {
 		if os.IsNotExist(err) {
 			r.logger.WarnContext(ctx, "No products found in database",
@@ -78,16 +77,21 @@ func (r *productRepository) GetAll(ctx context.Context) (productsSlice []models.
 		slog.Int("product_count", len(productsMap)),
 		slog.String("operation", "entity_transformation"))
 
+	// Checked once: building the per-product attributes allocates even when debug is filtered out
+	debugEnabled := r.logger.Enabled(ctx, slog.LevelDebug)
+
 	productsSlice = make([]models.Product, 0, len(productsMap))
 	for _, p := range productsMap {
 		productsSlice = append(productsSlice, p)
-		r.logger.DebugContext(ctx, "Processing individual product entity data",
-			slog.String("product_name", p.Name),
-			slog.String("product_category", p.Category),
-			slog.Float64("product_price", p.Price),
-			slog.Int("stock", p.Stock),
-			slog.String("component", "product_repository"))
-			slog.String("operation", "entity_processing")
+		if debugEnabled {
+			r.logger.DebugContext(ctx, "Processing individual product entity data",
+				slog.String("product_name", p.Name),
+				slog.String("product_category", p.Category),
+				slog.Float64("product_price", p.Price),
+				slog.Int("stock", p.Stock),
+				slog.String("component", "product_repository"),
+				slog.String("operation", "entity_processing"))
+		}
 	}
 
 	// Update product stock levels for telemetry
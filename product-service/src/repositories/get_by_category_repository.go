@@ -43,8 +43,7 @@ func (r *productRepository) GetByCategory(ctx context.Context, category string)
 		slog.String("component", "product_repository"),
 		slog.String("operation", "read_from_database"))
 
-	var productsMap map[string]models.Product
-	err := r.database.Read(ctx, &productsMap)
+	productsByCategory, err := r.loadCategories(ctx)
 	if err != nil {
 		if os.IsNotExist(err) {
 			r.logger.WarnContext(ctx, "No products found in database",
@@ -75,16 +74,18 @@ func (r *productRepository) GetByCategory(ctx context.Context, category string)
 		}
 	}
 
-	r.logger.DebugContext(ctx, "Applying category filter to product inventory data",
+	r.logger.DebugContext(ctx, "Looking up category in product inventory index",
 		slog.String("category", category),
 		slog.String("component", "product_repository"),
-		slog.Int("total_products", len(productsMap)),
+		slog.Int("total_categories", len(productsByCategory)),
 		slog.String("operation", "category_match"))
 
-	filteredProducts = make([]models.Product, 0)
-	for _, p := range productsMap {
-		if p.Category == category {
-			filteredProducts = append(filteredProducts, p)
+	// The index holds every category's products, so the lookup replaces a scan of all products
+	filteredProducts = productsInCategory(productsByCategory, category)
+
+	// Checked once: building the per-product attributes allocates even when debug is filtered out
+	if r.logger.Enabled(ctx, slog.LevelDebug) {
+		for _, p := range filteredProducts {
 			r.logger.DebugContext(ctx, "Product entity matches requested category criteria",
 				slog.String("product_name", p.Name),
 				slog.Int("stock", p.Stock),
@@ -107,3 +108,12 @@ func (r *productRepository) GetByCategory(ctx context.Context, category string)
 
 	return filteredProducts, appErr // appErr is nil here if successful
 }
+
+// productsInCategory returns a copy of the indexed products for category, or an empty slice if
+// there are none. The index is shared between requests, so callers must not get its slices.
+func productsInCategory(productsByCategory map[string][]models.Product, category string) []models.Product {
+	indexed := productsByCategory[category]
+	products := make([]models.Product, len(indexed))
+	copy(products, indexed)
+	return products
+}
@@ -0,0 +1,46 @@
+package repositories
+
+import (
+	"context"
+	"sort"
+	"testing"
+
+	"github.com/narender/product-service/src/models"
+)
+
+func TestProductsInCategoryReturnsCopy(t *testing.T) {
+	r := &productRepository{}
+	r.setProductsLocked(map[string]models.Product{
+		"Apple":  {Name: "Apple", Category: "fruit", Stock: 5},
+		"Banana": {Name: "Banana", Category: "fruit", Stock: 3},
+		"Carrot": {Name: "Carrot", Category: "vegetable", Stock: 7},
+	})
+
+	categories, err := r.loadCategories(context.Background())
+	if err != nil {
+		t.Fatalf("loadCategories: %v", err)
+	}
+	want := append([]models.Product(nil), categories["fruit"]...)
+
+	got := productsInCategory(categories, "fruit")
+	got[0].Stock = -1
+	sort.Slice(got, func(i, j int) bool { return got[i].Name > got[j].Name })
+	_ = append(got[:1], models.Product{Name: "Durian", Category: "fruit"})
+
+	cached := r.categories["fruit"]
+	if len(cached) != len(want) {
+		t.Fatalf("cached category has %d products, want %d", len(cached), len(want))
+	}
+	for i := range want {
+		if cached[i] != want[i] {
+			t.Errorf("cached product %d changed: got %+v, want %+v", i, cached[i], want[i])
+		}
+	}
+}
+
+func TestProductsInCategoryUnknownCategory(t *testing.T) {
+	got := productsInCategory(map[string][]models.Product{}, "missing")
+	if got == nil || len(got) != 0 {
+		t.Fatalf("got %v, want an empty non-nil slice", got)
+	}
+}
@@ -43,8 +43,7 @@ func (r *productRepository) GetByName(ctx context.Context, name string) (product
 		slog.String("operation", "access_database"),
 		slog.String("product_name", name))
 
-	var productsMap map[string]models.Product
-	err := r.database.Read(ctx, &productsMap)
+	productsMap, err := r.loadProducts(ctx)
 	if err != nil {
 		errMsg := "Failed to read product data from database"
 		r.logger.ErrorContext(ctx, "Database access error during product lookup",
@@ -2,6 +2,7 @@ package repositories
 
 import (
 	"log/slog"
+	"sync"
 
 	db "github.com/narender/common/db"
 	"github.com/narender/common/globals"
@@ -21,9 +22,25 @@ type ProductRepository interface {
 	GetByCategory(ctx context.Context, category string) ([]models.Product, *apierrors.AppError)
 }
 
+// productStore is the persistence used by productRepository; *db.FileDatabase in the service.
+type productStore interface {
+	Read(ctx context.Context, dest interface{}) error
+	Write(ctx context.Context, data interface{}) error
+}
+
 type productRepository struct {
-	database *db.FileDatabase
+	database productStore
 	logger   *slog.Logger
+
+	// Serializes stock updates (read, modify, write to file) without blocking readers; mu is only
+	// taken for the final swap of the maps.
+	writeMu sync.Mutex
+
+	// In-memory copy of the product file. The service is the only writer of its data file, so the
+	// file is read once and the maps are replaced (never modified in place) on every stock update.
+	mu         sync.RWMutex
+	products   map[string]models.Product
+	categories map[string][]models.Product // products grouped by category, see indexByCategory
 }
 
 // NewProductRepository creates a new repository instance loading data from a JSON file.
@@ -34,3 +51,75 @@ func NewProductRepository() ProductRepository {
 	}
 	return repo
 }
+
+// loadProducts returns the cached product map, reading the database file on first use.
+// The returned map is shared between requests and must not be modified.
+func (r *productRepository) loadProducts(ctx context.Context) (map[string]models.Product, error) {
+	r.mu.RLock()
+	products := r.products
+	r.mu.RUnlock()
+	if products != nil {
+		return products, nil
+	}
+
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	return r.loadProductsLocked(ctx)
+}
+
+// loadProductsLocked is loadProducts for callers that already hold r.mu for writing.
+func (r *productRepository) loadProductsLocked(ctx context.Context) (map[string]models.Product, error) {
+	if r.products != nil {
+		return r.products, nil
+	}
+
+	var productsMap map[string]models.Product
+	if err := r.database.Read(ctx, &productsMap); err != nil {
+		return nil, err
+	}
+	if productsMap == nil {
+		productsMap = map[string]models.Product{}
+	}
+	r.setProductsLocked(productsMap)
+	return productsMap, nil
+}
+
+// loadCategories returns the cached products grouped by category, reading the database file on
+// first use. The returned map and slices are shared between requests and must not be modified.
+func (r *productRepository) loadCategories(ctx context.Context) (map[string][]models.Product, error) {
+	r.mu.RLock()
+	categories := r.categories
+	r.mu.RUnlock()
+	if categories != nil {
+		return categories, nil
+	}
+
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	if _, err := r.loadProductsLocked(ctx); err != nil {
+		return nil, err
+	}
+	return r.categories, nil
+}
+
+// setProducts publishes an updated product map; readers see either the old maps or the new ones.
+func (r *productRepository) setProducts(products map[string]models.Product) {
+	r.mu.Lock()
+	r.setProductsLocked(products)
+	r.mu.Unlock()
+}
+
+// setProductsLocked replaces the cached products and rebuilds the category index; r.mu must be
+// held for writing.
+func (r *productRepository) setProductsLocked(products map[string]models.Product) {
+	r.products = products
+	r.categories = indexByCategory(products)
+}
+
+func indexByCategory(products map[string]models.Product) map[string][]models.Product {
+	categories := make(map[string][]models.Product)
+	for _, p := range products {
+		categories[p.Category] = append(categories[p.Category], p)
+	}
+	return categories
+}
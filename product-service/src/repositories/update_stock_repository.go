@@ -46,8 +46,12 @@ func (r *productRepository) UpdateStock(ctx context.Context, name string, newSto
 		slog.String("product_name", name),
 		slog.String("operation", "database_read"))
 
-	var productsMap map[string]models.Product
-	err := r.database.Read(ctx, &productsMap)
+	// Held for the whole read-modify-write so concurrent updates cannot overwrite each other;
+	// readers only wait for the final swap in setProducts
+	r.writeMu.Lock()
+	defer r.writeMu.Unlock()
+
+	productsMap, err := r.loadProducts(ctx)
 	if err != nil {
 		errMsg := "Failed to read product data from database"
 		r.logger.ErrorContext(ctx, "Database access error",
@@ -97,7 +101,13 @@ func (r *productRepository) UpdateStock(ctx context.Context, name string, newSto
 
 	oldStock := product.Stock
 	product.Stock = newStock
-	productsMap[name] = product
+
+	// Readers may still hold the current map, so the update goes into a copy
+	updatedProducts := make(map[string]models.Product, len(productsMap))
+	for productName, p := range productsMap {
+		updatedProducts[productName] = p
+	}
+	updatedProducts[name] = product
 
 	span.SetAttributes(attribute.Int("product.old_stock", oldStock))
 
@@ -118,7 +128,7 @@ func (r *productRepository) UpdateStock(ctx context.Context, name string, newSto
 		slog.String("stock_change_type", stockChangeType),
 		slog.String("operation", "stock_update"))
 
-	if writeErr := r.database.Write(ctx, productsMap); writeErr != nil {
+	if writeErr := r.database.Write(ctx, updatedProducts); writeErr != nil {
 		errMsg := "Failed to write updated product data"
 		r.logger.ErrorContext(ctx, "Database write error",
 			slog.String("component", "product_repository"),
@@ -139,6 +149,8 @@ func (r *productRepository) UpdateStock(ctx context.Context, name string, newSto
 		return appErr
 	}
 
+	r.setProducts(updatedProducts)
+
 	// Update product stock level for telemetry
 	metric.UpdateProductStockLevels(ctx, product.Name, product.Category, int64(newStock))
 
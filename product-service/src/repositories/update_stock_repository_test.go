@@ -0,0 +1,89 @@
+package repositories
+
+import (
+	"context"
+	"io"
+	"log/slog"
+	"testing"
+	"time"
+
+	"github.com/narender/common/globals"
+	"github.com/narender/product-service/src/models"
+
+	apierrors "github.com/narender/common/apierrors"
+)
+
+// blockingStore serves a fixed product map and holds every Write until release is closed.
+type blockingStore struct {
+	products map[string]models.Product
+	writing  chan struct{}
+	release  chan struct{}
+}
+
+func (s *blockingStore) Read(ctx context.Context, dest interface{}) error {
+	productsMap := make(map[string]models.Product, len(s.products))
+	for name, p := range s.products {
+		productsMap[name] = p
+	}
+	*dest.(*map[string]models.Product) = productsMap
+	return nil
+}
+
+func (s *blockingStore) Write(ctx context.Context, data interface{}) error {
+	close(s.writing)
+	<-s.release
+	return nil
+}
+
+func TestUpdateStockDoesNotBlockReads(t *testing.T) {
+	if err := globals.Init(); err != nil {
+		t.Fatalf("globals.Init: %v", err)
+	}
+	ctx := context.Background()
+	store := &blockingStore{
+		products: map[string]models.Product{
+			"Apple":  {Name: "Apple", Category: "fruit", Stock: 5},
+			"Carrot": {Name: "Carrot", Category: "vegetable", Stock: 7},
+		},
+		writing: make(chan struct{}),
+		release: make(chan struct{}),
+	}
+	r := &productRepository{
+		database: store,
+		logger:   slog.New(slog.NewTextHandler(io.Discard, nil)),
+	}
+
+	updated := make(chan *apierrors.AppError, 1)
+	go func() { updated <- r.UpdateStock(ctx, "Apple", 1) }()
+	<-store.writing
+
+	// The update is stuck in its file write; reads must still complete and see the old stock
+	read := make(chan models.Product, 1)
+	go func() {
+		product, _ := r.GetByName(ctx, "Apple")
+		fruit, _ := r.GetByCategory(ctx, "fruit")
+		if len(fruit) != 1 || fruit[0] != product {
+			product = models.Product{}
+		}
+		read <- product
+	}()
+	select {
+	case product := <-read:
+		if product.Stock != 5 {
+			t.Errorf("read during update got %+v, want the old stock 5", product)
+		}
+	case <-time.After(2 * time.Second):
+		t.Fatal("read blocked by the in-progress stock update")
+	}
+
+	close(store.release)
+	if appErr := <-updated; appErr != nil {
+		t.Fatalf("UpdateStock: %v", appErr)
+	}
+
+	product, _ := r.GetByName(ctx, "Apple")
+	fruit, _ := r.GetByCategory(ctx, "fruit")
+	if product.Stock != 1 || len(fruit) != 1 || fruit[0].Stock != 1 {
+		t.Errorf("after update got %+v and %+v, want stock 1", product, fruit)
+	}
+}